@@ -16,8 +16,8 @@ import re
 import string
 import sys
 import fnmatch
-import subprocess
 from collections.abc import MutableMapping
+from functools import lru_cache
 from typing import ClassVar
 
 from envara.env_chars import EnvChars
@@ -36,6 +36,12 @@ class Env:
 
     ###########################################################################
 
+    GLOB_CHARS: ClassVar[str] = "*?["
+    """Characters that make a ``${NAME#pattern}`` etc. a glob, not a literal."""
+
+    GLOB_RE_CACHE_SIZE: ClassVar[int] = 256
+    """Maximum number of compiled ``${NAME/pattern/...}`` globs to keep."""
+
     IS_POSIX: ClassVar[bool] = EnvChars.IS_POSIX
     """``True`` if the app is running under Linux, UNIX, BSD, macOS or similar."""
 
@@ -45,6 +51,9 @@ class Env:
     IS_WINDOWS: ClassVar[bool] = EnvChars.IS_WINDOWS
     """``True`` if the app is running under Windows or OS/2."""
 
+    PLATFORMS_CACHE_SIZE: ClassVar[int] = 32
+    """Maximum number of memoized ``Env.get_cur_platforms()`` results."""
+
     PLATFORM_POSIX: ClassVar[str] = "posix"
     """A ``str`` indicating a POSIX-compatible platform."""
 
@@ -54,6 +63,21 @@ class Env:
     PLATFORM_THIS: ClassVar[str] = sys.platform.lower()
     """A ``str`` indicating the running platform."""
 
+    RE_BRACE: ClassVar[re.Pattern[str]] = re.compile(r"[{}]")
+    """Opening or closing brace, to find the end of ``${...}`` without a loop."""
+
+    RE_BRACED_INDEX: ClassVar[re.Pattern[str]] = re.compile(r"^(\d+)")
+    """Positional argument at the start of a braced expansion: ``${1...}``."""
+
+    RE_BRACED_NAME: ClassVar[re.Pattern[str]] = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)")
+    """Variable name at the start of a braced expansion: ``${NAME...}``."""
+
+    RE_BRACED_SUBSTR: ClassVar[re.Pattern[str]] = re.compile(r"^:(-?\d+)(?::(-?\d+))?$")
+    """Substring part of a braced expansion: ``${NAME:offset[:length]}``."""
+
+    RE_DIGITS: ClassVar[re.Pattern[str]] = re.compile(r"\d+")
+    """Run of decimal digits, matched at a given position by the scanners."""
+
     SPECIAL: ClassVar[dict[str, str]] = {
         "a": "\a",
         "b": "\b",
@@ -85,6 +109,9 @@ class Env:
     }
     """``dict[str, list[str]]``: regex => list-of-platform-names."""
 
+    UNESCAPE_RE_CACHE_SIZE: ClassVar[int] = 8
+    """Maximum number of escape characters memoized by `unescape()`."""
+
     ###########################################################################
 
     @staticmethod
@@ -136,6 +163,51 @@ class Env:
 
     ###########################################################################
 
+    @staticmethod
+    @lru_cache(maxsize=GLOB_RE_CACHE_SIZE)
+    def __compile_glob(pattern: str) -> re.Pattern[str]:
+        """
+        Convert a glob `pattern` to an unanchored regex and compile it. Memoized,
+        as the same ``${NAME/pattern/...}`` gets expanded over and over again.
+
+        :param pattern: Glob pattern to convert.
+        :type pattern: ``str``
+
+        :return: Compiled regex.
+        :rtype: ``re.Pattern[str]``
+        """
+        core = fnmatch.translate(pattern)
+
+        if core.startswith("(?s:"):
+            if core.endswith(")\\Z") or core.endswith(")\\z"):
+                core = core[4:-3]
+
+        return re.compile(core, re.DOTALL)
+
+    ###########################################################################
+
+    @staticmethod
+    @lru_cache(maxsize=UNESCAPE_RE_CACHE_SIZE)
+    def __compile_unescape(escape: str) -> re.Pattern[str]:
+        """
+        Compile a regex matching an escape sequence: `escape` followed by
+        ``u`` with up to 4 hex digits (group 1), ``x`` with up to 2 hex digits
+        (group 2), any other character (group 3), or the end of input (no
+        group). Incomplete codes get matched too, so they could be reported.
+
+        :param escape: Escape character.
+        :type escape: ``str``
+
+        :return: Compiled regex.
+        :rtype: ``re.Pattern[str]``
+        """
+        return re.compile(
+            rf"{re.escape(escape)}"
+            r"(?:u([0-9A-Fa-f]{0,4})|x([0-9A-Fa-f]{0,2})|([\s\S])|\Z)"
+        )
+
+    ###########################################################################
+
     @staticmethod
     def escape(
         input: str | None,
@@ -327,6 +399,12 @@ class Env:
         expand_char = chars.expand
         escape_char = chars.escape
 
+        # Nothing to expand: escapes are kept as is unless followed by the
+        # expand character or a backtick, so the input is the result
+
+        if (expand_char not in s) and not (is_bktick_cmd and (bktick in s)):
+            return s
+
         def eval_braced(inner: str) -> str:
             # Length: ${#NAME}
             if inner.startswith("#"):
@@ -337,10 +415,10 @@ class Env:
                 return str(len(val))
 
             # Parse name
-            m = re.match(r"^([A-Za-z_][A-Za-z0-9_]*)", inner)
+            m = Env.RE_BRACED_NAME.match(inner)
             if not m:
                 # Support numeric positional parameters inside braces: ${1}, ${2}
-                md = re.match(r"^(\d+)", inner)
+                md = Env.RE_BRACED_INDEX.match(inner)
                 if md:
                     name = md.group(1)
                     rest = inner[md.end() :]
@@ -360,10 +438,10 @@ class Env:
                 rest = inner[m.end() :]
                 val = vars.get(name)
                 is_set = val is not None
-                is_null = (val == "") if is_set else False
+                is_null = val == ""
 
             # Substring: :offset[:length]
-            sm = re.match(r"^:(-?\d+)(?::(-?\d+))?$", rest)
+            sm = Env.RE_BRACED_SUBSTR.match(rest)
             if sm:
                 offset = int(sm.group(1))
                 length = int(sm.group(2)) if sm.group(2) is not None else None
@@ -407,35 +485,42 @@ class Env:
                 return val or ""
 
             # Pattern removals: #, ## (prefix) and %, %% (suffix)
-            if rest.startswith("##") or rest.startswith("#"):
-                pattern = rest[2:] if rest.startswith("##") else rest[1:]
+            if rest.startswith("#"):
+                is_longest = rest.startswith("##")
+                pattern = rest[2:] if is_longest else rest[1:]
                 if not is_set:
                     return f"{expand_char}{{{inner}}}"
                 text = val or ""
+                if not Env.__is_glob(pattern):
+                    if text.startswith(pattern):
+                        return text[len(pattern) :]
+                    return text
+                prog = Env.__compile_glob(pattern)
                 best_i = None
                 for i in range(0, len(text) + 1):
-                    if fnmatch.fnmatchcase(text[0:i], pattern):
-                        if rest.startswith("##"):
-                            best_i = i
-                        else:
-                            best_i = i
+                    if prog.fullmatch(text, 0, i):
+                        best_i = i
+                        if not is_longest:
                             break
                 if best_i is None:
                     return text
                 return text[best_i:]
-            if rest.startswith("%%") or rest.startswith("%"):
-                pattern = rest[2:] if rest.startswith("%%") else rest[1:]
+            if rest.startswith("%"):
+                is_longest = rest.startswith("%%")
+                pattern = rest[2:] if is_longest else rest[1:]
                 if not is_set:
                     return f"{expand_char}{{{inner}}}"
                 text = val or ""
+                if not Env.__is_glob(pattern):
+                    if text.endswith(pattern):
+                        return text[: len(text) - len(pattern)]
+                    return text
+                prog = Env.__compile_glob(pattern)
                 best_i = None
                 for i in range(0, len(text) + 1):
-                    sub = text[len(text) - i :]
-                    if fnmatch.fnmatchcase(sub, pattern):
-                        if rest.startswith("%%"):
-                            best_i = i
-                        else:
-                            best_i = i
+                    if prog.fullmatch(text, len(text) - i):
+                        best_i = i
+                        if not is_longest:
                             break
                 if best_i is None:
                     return text
@@ -474,11 +559,6 @@ class Env:
                 if not is_set:
                     return f"{expand_char}{{{inner}}}"
 
-                core = fnmatch.translate(pat)
-                if core.startswith("(?s:"):
-                    if core.endswith(")\\Z") or core.endswith(")\\z"):
-                        core = core[4:-3]
-
                 repl_eval = str(
                     Env.__expand_posix(
                         repl,
@@ -490,13 +570,47 @@ class Env:
                     )
                 )
 
+                # Anchored patterns must match the whole prefix or suffix:
+                # check each candidate with fullmatch() bounded by pos or
+                # endpos rather than slicing and re-matching via fnmatch
+
+                # A literal anchored pattern can only match at one length
+
+                if (anchor is not None) and pat and not Env.__is_glob(pat):
+                    text = val or ""
+                    if anchor == "#":
+                        while text.startswith(pat):
+                            new_text = repl_eval + text[len(pat) :]
+                            if (not is_all) or (new_text == text):
+                                return new_text
+                            text = new_text
+                    else:
+                        while text.endswith(pat):
+                            new_text = text[: len(text) - len(pat)] + repl_eval
+                            if (not is_all) or (new_text == text):
+                                return new_text
+                            text = new_text
+                    return text
+
+                # re.sub() expands backslash escapes in the replacement, so
+                # the plain replace is only equivalent when there are none
+
+                if (
+                    (anchor is None)
+                    and ("\\" not in repl_eval)
+                    and (not Env.__is_glob(pat))
+                ):
+                    return (val or "").replace(pat, repl_eval, -1 if is_all else 1)
+
+                prog = Env.__compile_glob(pat)
+
                 if anchor == "#":
                     text = val or ""
                     if is_all:
                         while True:
                             changed = False
                             for i in range(1, len(text) + 1):
-                                if fnmatch.fnmatchcase(text[:i], pat):
+                                if prog.fullmatch(text, 0, i):
                                     new_text = repl_eval + text[i:]
                                     if new_text == text:
                                         changed = False
@@ -509,7 +623,7 @@ class Env:
                         return text
                     else:
                         for i in range(1, len(text) + 1):
-                            if fnmatch.fnmatchcase(text[:i], pat):
+                            if prog.fullmatch(text, 0, i):
                                 return repl_eval + text[i:]
                         return val or ""
 
@@ -519,8 +633,7 @@ class Env:
                         while True:
                             changed = False
                             for i in range(1, len(text) + 1):
-                                sub = text[len(text) - i :]
-                                if fnmatch.fnmatchcase(sub, pat):
+                                if prog.fullmatch(text, len(text) - i):
                                     new_text = text[: len(text) - i] + repl_eval
                                     if new_text == text:
                                         changed = False
@@ -533,13 +646,10 @@ class Env:
                         return text
                     else:
                         for i in range(1, len(text) + 1):
-                            sub = text[len(text) - i :]
-                            if fnmatch.fnmatchcase(sub, pat):
+                            if prog.fullmatch(text, len(text) - i):
                                 return text[: len(text) - i] + repl_eval
                         return val or ""
 
-                pattern = core
-                prog = re.compile(pattern, re.DOTALL)
                 val = val or ""
                 if is_all:
                     return prog.sub(repl_eval, val)
@@ -651,13 +761,10 @@ class Env:
                 text = val
                 if pattern:
                     # Uppercase all characters matching pattern
-                    result = ""
-                    for ch in text:
-                        if fnmatch.fnmatchcase(ch, pattern):
-                            result += ch.upper()
-                        else:
-                            result += ch
-                    return result
+                    prog = Env.__compile_glob(pattern)
+                    return "".join(
+                        ch.upper() if prog.fullmatch(ch) else ch for ch in text
+                    )
                 return text.upper()
             if rest.startswith("^"):
                 pattern = rest[1:] if len(rest) > 1 else None
@@ -666,7 +773,7 @@ class Env:
                 text = val
                 if pattern:
                     # Uppercase first character if it matches pattern
-                    if text and fnmatch.fnmatchcase(text[0], pattern):
+                    if text and Env.__compile_glob(pattern).fullmatch(text, 0, 1):
                         return text[0].upper() + text[1:]
                     return text
                 if text:
@@ -679,13 +786,10 @@ class Env:
                 text = val
                 if pattern:
                     # Lowercase all characters matching pattern
-                    result = ""
-                    for ch in text:
-                        if fnmatch.fnmatchcase(ch, pattern):
-                            result += ch.lower()
-                        else:
-                            result += ch
-                    return result
+                    prog = Env.__compile_glob(pattern)
+                    return "".join(
+                        ch.lower() if prog.fullmatch(ch) else ch for ch in text
+                    )
                 return text.lower()
             if rest.startswith(","):
                 pattern = rest[1:] if len(rest) > 1 else None
@@ -694,7 +798,7 @@ class Env:
                 text = val
                 if pattern:
                     # Lowercase first character if it matches pattern
-                    if text and fnmatch.fnmatchcase(text[0], pattern):
+                    if text and Env.__compile_glob(pattern).fullmatch(text, 0, 1):
                         return text[0].lower() + text[1:]
                     return text
                 if text:
@@ -717,6 +821,12 @@ class Env:
                 return val or ""
             return f"{expand_char}{{{inner}}}"
 
+        # Characters that may start something other than a literal
+
+        stop_chars = [
+            x for x in (escape_char, expand_char, bktick if is_bktick_cmd else "") if x
+        ]
+
         while i < inp_len:
             ch = s[i]
 
@@ -769,6 +879,8 @@ class Env:
                     res.append(s[i : j + 1])
                     i = j + 1
                     continue
+                import subprocess  # deferred: rarely needed, costly to import
+
                 try:
                     if allow_shell:
                         proc = subprocess.run(
@@ -800,8 +912,15 @@ class Env:
                 continue
 
             if ch != expand_char:
-                res.append(ch)
-                i += 1
+                # Copy the whole run of literal characters at once
+
+                j = inp_len
+                for stop_char in stop_chars:
+                    k = s.find(stop_char, i + 1, j)
+                    if k >= 0:
+                        j = k
+                res.append(s[i:j])
+                i = j
                 continue
 
             if (i + 1) < inp_len and s[i + 1] == expand_char:
@@ -846,6 +965,8 @@ class Env:
                     res.append(s[i : j + 1])
                     i = j + 1
                     continue
+                import subprocess  # deferred: rarely needed, costly to import
+
                 try:
                     if allow_shell:
                         proc = subprocess.run(
@@ -879,16 +1000,18 @@ class Env:
             if (i + 1) < inp_len and s[i + 1] == "{":
                 j = i + 2
                 depth = 1
-                while j < inp_len:
+                while True:
+                    brace = Env.RE_BRACE.search(s, j)
+                    if brace is None:
+                        raise ValueError(f"Unterminated braced expansion in: {input}")
+                    j = brace.start()
                     if s[j] == "{":
                         depth += 1
-                    elif s[j] == "}":
+                    else:
                         depth -= 1
                         if depth == 0:
                             break
                     j += 1
-                if j >= inp_len:
-                    raise ValueError(f"Unterminated braced expansion in: {input}")
                 inner = s[i + 2 : j]
                 res.append(eval_braced(inner))
                 i = j + 1
@@ -897,11 +1020,10 @@ class Env:
             j = i + 1
             if j < inp_len:
                 ch2 = s[j]
-                if ch2.isdigit():
-                    start = j
-                    while j < inp_len and s[j].isdigit():
-                        j += 1
-                    idx = int(s[start:j]) - 1
+                digits = Env.RE_DIGITS.match(s, j)
+                if digits:
+                    j = digits.end()
+                    idx = int(digits.group()) - 1
                     if args and 0 <= idx < len(args):
                         res.append(args[idx])
                     else:
@@ -963,10 +1085,26 @@ class Env:
         is_windows = chars.is_windows
 
         s = str(input) if is_path else input
+
+        # Nothing to expand: escapes are kept as is unless followed by the
+        # expand character, so the input is the result
+
+        if expand_char not in s:
+            return s
+
         i = 0
         ln = len(s)
         out: list[str] = []
 
+        # Characters that may start something other than a literal
+
+        stop_chars = [x for x in (escape_char, expand_char) if x]
+
+        # Parts of argument paths already taken by %~<modifiers><digits>,
+        # keyed by (argument index, modifier)
+
+        path_parts: dict[tuple[int, str], str] = {}
+
         while i < ln:
             ch = s[i]
 
@@ -978,12 +1116,10 @@ class Env:
                             out.append(expand_char)
                             i += 3
                             continue
-                        if (i + 2) < ln and s[i + 2].isdigit():
-                            j = i + 2
-                            while j < ln and s[j].isdigit():
-                                j += 1
-                            out.append(expand_char + s[i + 2 : j])
-                            i = j
+                        digits = Env.RE_DIGITS.match(s, i + 2)
+                        if digits:
+                            out.append(expand_char + digits.group())
+                            i = digits.end()
                             continue
                         k = s.find(windup_char, i + 2)
                         if k != -1:
@@ -1003,8 +1139,15 @@ class Env:
                     continue
 
             if ch != expand_char:
-                out.append(ch)
-                i += 1
+                # Copy the whole run of literal characters at once
+
+                j = ln
+                for stop_char in stop_chars:
+                    k = s.find(stop_char, i + 1, j)
+                    if k >= 0:
+                        j = k
+                out.append(s[i:j])
+                i = j
                 continue
 
             if (i + 1) < ln and s[i + 1] == windup_char:
@@ -1021,11 +1164,10 @@ class Env:
                     while k < ln and s[k].isalpha():
                         mods.append(s[k])
                         k += 1
-                    if k < ln and s[k].isdigit():
-                        start = k
-                        while k < ln and s[k].isdigit():
-                            k += 1
-                        token = s[start:k]
+                    digits = Env.RE_DIGITS.match(s, k)
+                    if digits:
+                        k = digits.end()
+                        token = digits.group()
                         end_with_windup = False
                         if k < ln and s[k] == windup_char:
                             end_with_windup = True
@@ -1035,39 +1177,13 @@ class Env:
                         if args and 0 <= idx < len(args):
                             tokval = args[idx]
 
-                            def part_drive(t: str) -> str:
-                                return os.path.splitdrive(t)[0]
-
-                            def part_path(t: str) -> str:
-                                p = os.path.dirname(t)
-                                if p and not p.endswith(os.sep):
-                                    p = p + os.sep
-                                return p
-
-                            def part_name(t: str) -> str:
-                                return os.path.splitext(os.path.basename(t))[0]
-
-                            def part_ext(t: str) -> str:
-                                return os.path.splitext(t)[1]
-
-                            def part_full(t: str) -> str:
-                                return os.path.abspath(t)
-
-                            out_frag: list[str] = []
                             for m in mods:
-                                if m == "d":
-                                    out_frag.append(part_drive(tokval))
-                                elif m == "p":
-                                    out_frag.append(part_path(tokval))
-                                elif m == "n":
-                                    out_frag.append(part_name(tokval))
-                                elif m == "x":
-                                    out_frag.append(part_ext(tokval))
-                                elif m == "f":
-                                    out_frag.append(part_full(tokval))
-                                else:
-                                    pass
-                            out.append("".join(out_frag))
+                                key = (idx, m)
+                                part = path_parts.get(key)
+                                if part is None:
+                                    part = Env.__get_path_part(tokval, m)
+                                    path_parts[key] = part
+                                out.append(part)
                         else:
                             if end_with_windup:
                                 out.append(expand_char + s[j:k] + windup_char)
@@ -1076,17 +1192,14 @@ class Env:
                         i = k
                         continue
 
-                if j < ln and s[j].isdigit():
-                    start = j
-                    while j < ln and s[j].isdigit():
-                        j += 1
+                digits = Env.RE_DIGITS.match(s, j)
+                if digits:
+                    j = digits.end()
+                    token = digits.group()
                     end_with_windup = False
                     if j < ln and s[j] == windup_char:
                         end_with_windup = True
-                        token = s[start:j]
                         j += 1
-                    else:
-                        token = s[start:j]
 
                     idx = int(token) - 1
                     if args and 0 <= idx < len(args):
@@ -1197,25 +1310,21 @@ class Env:
         :rtype: ``list[str]``
         """
 
-        # Initialize the return value
+        # Collect distinct platforms preserving the order: a dict does that
+        # with a hash lookup rather than a scan of the list for every item.
+        # Add default platform first if needed
 
-        result: list[str] = []
-
-        # Add default platform if needed
+        result: dict[str, None] = {}
 
         if flags & EnvPlatformFlags.ADD_EMPTY:
-            result.append("")
-
-        # Traverse the lists of platforms and append distinct
+            result[""] = None
 
         for platforms in Env.SYS_PLATFORM_MAP.values():
-            for platform in platforms:
-                if platform not in result:
-                    result.append(platform)
+            result.update(dict.fromkeys(platforms))
 
         # Return the accumulated list
 
-        return result
+        return list(result)
 
     ###########################################################################
 
@@ -1230,6 +1339,10 @@ class Env:
         string is added first to the returned list if you set the
         ``EnvPlatformFlags.ADD_EMPTY`` bit in `flags`.
 
+        The result is computed once per combination of `flags`, ``IS_POSIX``,
+        ``IS_WINDOWS``, ``PLATFORM_THIS`` and ``SYS_PLATFORM_MAP`` content,
+        then reused.
+
         :param flags: Controls which items will be added to the list.
         :type flags: ``EnvPlatformFlags``
 
@@ -1237,6 +1350,30 @@ class Env:
         :rtype: ``list[str]``
         """
 
+        platform_map = tuple((k, tuple(v)) for k, v in Env.SYS_PLATFORM_MAP.items())
+
+        return list(
+            Env.__get_cur_platforms(
+                flags, Env.IS_POSIX, Env.IS_WINDOWS, Env.PLATFORM_THIS, platform_map
+            )
+        )
+
+    ###########################################################################
+
+    @staticmethod
+    @lru_cache(maxsize=PLATFORMS_CACHE_SIZE)
+    def __get_cur_platforms(
+        flags: EnvPlatformFlags,
+        is_posix: bool,
+        is_windows: bool,
+        platform_this: str,
+        platform_map: tuple[tuple[str, tuple[str, ...]], ...],
+    ) -> tuple[str, ...]:
+        """
+        Memoized implementation of `Env.get_cur_platforms()`: every value it
+        depends on is passed explicitly to serve as the cache key.
+        """
+
         # Initialize the return value
 
         result: list[str] = []
@@ -1244,16 +1381,16 @@ class Env:
         if flags & EnvPlatformFlags.ADD_EMPTY:
             result.append("")
 
-        # Traverse the {pattern: list-of-relevant-platforms} dictionary and
+        # Traverse the {pattern: list-of-relevant-platforms} pairs and
         # append those where the pattern matches the running platform
 
         re_flags = re.IGNORECASE | re.UNICODE
 
-        for pattern, platforms in Env.SYS_PLATFORM_MAP.items():
+        for pattern, platforms in platform_map:
             # If the platform doesn't match the running one, skip it
 
             if pattern:
-                if not re.search(pattern, Env.PLATFORM_THIS, re_flags):
+                if not re.search(pattern, platform_this, re_flags):
                     continue
 
             # Append every platform from the current list if eligible
@@ -1262,10 +1399,10 @@ class Env:
                 # Perform extra checks, platform is never empty or None
 
                 if platform == Env.PLATFORM_POSIX:
-                    if not Env.IS_POSIX:
+                    if not is_posix:
                         continue
                 elif platform == Env.PLATFORM_WINDOWS:
-                    if not Env.IS_WINDOWS:
+                    if not is_windows:
                         continue
 
                 # If the platform name was not added yet, add it
@@ -1275,7 +1412,62 @@ class Env:
 
         # Return the accumulated list
 
-        return result
+        return tuple(result)
+
+    ###########################################################################
+
+    @staticmethod
+    def __get_path_part(path: str, modifier: str) -> str:
+        """
+        Get the part of `path` selected by a Windows ``%~`` modifier: ``d``
+        for drive, ``p`` for directory with a trailing separator, ``n`` for
+        name without extension, ``x`` for extension and ``f`` for the full
+        path. Any other modifier selects nothing.
+
+        :param path: Path to take the part from.
+        :type path: ``str``
+
+        :param modifier: Modifier character.
+        :type modifier: ``str``
+
+        :return: Selected part of `path` or an empty string.
+        :rtype: ``str``
+        """
+        if modifier == "d":
+            return os.path.splitdrive(path)[0]
+
+        if modifier == "p":
+            dir = os.path.dirname(path)
+            if dir and not dir.endswith(os.sep):
+                dir = dir + os.sep
+            return dir
+
+        if modifier == "n":
+            return os.path.splitext(os.path.basename(path))[0]
+
+        if modifier == "x":
+            return os.path.splitext(path)[1]
+
+        if modifier == "f":
+            return os.path.abspath(path)
+
+        return ""
+
+    ###########################################################################
+
+    @staticmethod
+    def __is_glob(pattern: str) -> bool:
+        """
+        Check whether `pattern` contains any glob special character. If not,
+        it matches itself only, and plain string operations can be used.
+
+        :param pattern: Pattern to check.
+        :type pattern: ``str``
+
+        :return: True if `pattern` is a glob.
+        :rtype: ``bool``
+        """
+        return any((x in pattern) for x in Env.GLOB_CHARS)
 
     ###########################################################################
 
@@ -1377,14 +1569,14 @@ class Env:
                     if (not esc) or (esc not in result):
                         return result
 
-        # If input is not empty, escape the escape character, then the
-        # internal quote(s), then embrace the result in desired quotes
-        # and return
+        # If input is not empty, escape the escape character and the
+        # internal quote(s) in a single pass, then embrace the result in
+        # desired quotes and return
 
-        if esc in result:
-            result = result.replace(esc, f"{esc}{esc}")
-        if quote in result:
-            result = result.replace(quote, f"{esc}{quote}")
+        quote_map = chars.quote_map
+
+        if quote_map is not None:
+            result = result.translate(quote_map)
 
         return f"{quote}{result}{quote}"
 
@@ -1688,65 +1880,23 @@ class Env:
         if (not chars.escape) or chars.escape not in input:
             return input
 
-        # Loop through the input and accumulate valid characters in chr_lst
-
-        chr_lst: list[str] = []
-        cur_pos = -1
-        esc_pos = -1
-        is_escaped = False
-
-        # Start and end of a substring to accumulate for the code-to-string
-        # conversion
-
-        acc_beg_pos = -1
-        acc_end_pos = -1
-
-        for cur_char in input:
-            cur_pos = cur_pos + 1
-
-            if (cur_pos >= acc_beg_pos) and (cur_pos < acc_end_pos):
-                if cur_char not in string.hexdigits:
-                    Env.__fail_unescape(input, esc_pos, cur_pos)
-                continue
+        # Replace every escape sequence in a single regex pass
 
-            if cur_pos == acc_end_pos:
-                chr_lst.append(chr(int(input[acc_beg_pos:acc_end_pos], 16)))
-                is_escaped = False
+        def unescape_one(match: re.Match[str]) -> str:
+            group_no = match.lastindex
 
-            if is_escaped:
-                if cur_char in Env.SPECIAL:
-                    cur_char = Env.SPECIAL[cur_char]
-                elif cur_char == "u":
-                    acc_beg_pos = cur_pos + 1
-                    acc_end_pos = acc_beg_pos + 4
-                    continue
-                elif cur_char == "x":
-                    acc_beg_pos = cur_pos + 1
-                    acc_end_pos = acc_beg_pos + 2
-                    continue
-                is_escaped = False
-            elif cur_char == chars.escape:
-                is_escaped = not is_escaped
-                esc_pos = cur_pos if (is_escaped) else -1
-                continue
-
-            chr_lst.append(cur_char)
+            if group_no == 3:
+                char = match.group(3)
+                return Env.SPECIAL.get(char, char)
 
-        # If escaped char (by code) is the last one, accumulation
-        # action was missed from the loop: fulfilling here
+            code = match.group(group_no) if group_no else ""
 
-        if is_escaped:
-            if acc_end_pos > 0:
-                if cur_pos >= acc_end_pos - 1:
-                    chr_lst.append(chr(int(input[acc_beg_pos:acc_end_pos], 16)))
-                elif esc_pos >= 0:  # pragma: no cover
-                    Env.__fail_unescape(input, esc_pos, cur_pos + 1)
-            elif esc_pos >= 0:  # pragma: no cover
-                Env.__fail_unescape(input, esc_pos, cur_pos + 1)
+            if len(code) != (4 if group_no == 1 else 2):
+                Env.__fail_unescape(input, match.start(), match.end())
 
-        # Join all characters into a string
+            return chr(int(code, 16))
 
-        result: str = "".join(chr_lst)
+        result: str = Env.__compile_unescape(chars.escape).sub(unescape_one, input)
 
         # Strip leading and/or trailing blanks if required, and return result
 
@@ -1798,17 +1948,7 @@ class Env:
         if quote_type == EnvQuoteType.HARD:
             quote = chars.hard_quote
             result = result[len(quote) :]
-            end_pos = -1
-            i = 0
-            orig_len: int = len(result)
-            while i < orig_len:
-                if result[i] == escape and i + 1 < orig_len:
-                    i += 2
-                    continue
-                if result[i] == quote:
-                    end_pos = i
-                    break
-                i += 1
+            end_pos = Env.__find_unescaped(result, quote, escape)
             if end_pos < 0:
                 raise ValueError(f"Unterminated hard-quoted string: {input}")
             return (result[0:end_pos], quote_type)
@@ -1816,48 +1956,23 @@ class Env:
         if quote_type == EnvQuoteType.NORMAL:
             quote = chars.normal_quote
             result = result[len(quote) :]
-            end_pos = -1
-            i = 0
-            orig_len: int = len(result)
-            while i < orig_len:
-                if result[i] == escape and i + 1 < orig_len:
-                    i += 2
-                    continue
-                if result[i] == quote:
-                    end_pos = i
-                    break
-                i += 1
+            end_pos = Env.__find_unescaped(result, quote, escape)
             if end_pos < 0:
                 raise ValueError(f"Unterminated quoted string: {input}")
             return (result[0:end_pos], quote_type)
 
         cutter = chars.cutter
 
-        if cutter:
-            i = 0
-            orig_len = len(result)
-            cutter_len = len(cutter)
-            strip_spaces = (flags & EnvExpandFlags.STRIP_SPACES) != 0
-            while i < orig_len:
-                if result[i] == escape and i + 1 < orig_len:
-                    i += 2
-                    continue
-                if cutter_len == 1:
-                    if result[i] == cutter:
-                        result = result[0:i]
-                        if strip_spaces:
-                            result = result.rstrip()
-                        break
-                else:
-                    if (
-                        i + cutter_len <= orig_len
-                        and result[i : i + cutter_len] == cutter
-                    ):
-                        result = result[0:i]
-                        if strip_spaces:
-                            result = result.rstrip()
-                        break
-                i += 1
+        # Find an unescaped line comment start, then cut it off with all
+        # what follows
+
+        if cutter and (cutter in result):
+            cut_pos = Env.__find_unescaped(result, cutter, escape)
+
+            if cut_pos >= 0:
+                result = result[0:cut_pos]
+                if (flags & EnvExpandFlags.STRIP_SPACES) != 0:
+                    result = result.rstrip()
 
         return (result, EnvQuoteType.NONE)
 
@@ -1887,5 +2002,46 @@ class Env:
             f'Incomplete escape sequence from [{beg_pos}]: "{dtl}" in "{input}"'
         )
 
+    ###########################################################################
+
+    @staticmethod
+    def __find_unescaped(input: str, substr: str, escape: str) -> int:
+        """
+        Find the first occurrence of `substr` not preceded by an odd number
+        of `escape` characters: every escape makes the next character skip.
+        Jumps between occurrences with ``str.find()`` rather than checking
+        every character.
+
+        :param input: String to search in
+        :type input: str
+
+        :param substr: String to search for
+        :type substr: str
+
+        :param escape: Escape character (may be empty)
+        :type escape: str
+
+        :return: Index of the unescaped `substr` or -1 if not found
+        :rtype: int
+        """
+
+        if (not escape) or (escape not in input):
+            return input.find(substr)
+
+        pos = 0
+
+        while True:
+            found_pos = input.find(substr, pos)
+
+            if found_pos < 0:
+                return -1
+
+            esc_pos = input.find(escape, pos, found_pos + 1)
+
+            if esc_pos < 0:
+                return found_pos
+
+            pos = esc_pos + 2
+
 
 ###############################################################################
@@ -5,6 +5,7 @@
 ###############################################################################
 
 
+from functools import lru_cache
 import re
 from typing import Any, ClassVar
 
@@ -16,6 +17,9 @@ class EnvCharsData:
     representing an OS-specific command into executable and arguments
     """
 
+    CMD_OPS_RE_CACHE_SIZE: ClassVar[int] = 16
+    """Maximum number of command-splitting regexes memoized by constructor"""
+
     DEFAULT_CMD_OPS: ClassVar[str] = " "
     """Default command-splitting operators"""
 
@@ -105,8 +109,8 @@ class EnvCharsData:
         self.expand: str = expand or ""
         self.expand_len: int = len(self.expand)
 
-        self.is_posix: bool = True if is_posix else False
-        self.is_windows: bool = True if is_windows else False
+        self.is_posix: bool = bool(is_posix)
+        self.is_windows: bool = bool(is_windows)
 
         self.windup: str = windup or ""
         self.windup_len: int = len(self.windup)
@@ -127,13 +131,9 @@ class EnvCharsData:
         self.all_quotes_len: int = len(self.all_quotes)
 
         self.cmd_ops: str = cmd_ops or EnvCharsData.DEFAULT_CMD_OPS
-
-        pat_str = "|".join([f"{re.escape(c)}+" for c in self.cmd_ops])
-
-        # The from-character is escaped already
-        pat_str = pat_str.replace(EnvCharsData.DEFAULT_CMD_OPS, r"s")
-
-        self.cmd_ops_re: re.Pattern[str] = re.compile(rf"({pat_str})")
+        self.cmd_ops_re: re.Pattern[str] = EnvCharsData.__compile_cmd_ops(
+            self.cmd_ops
+        )
 
         # Create translation table for the characters that should be
         # escaped when used as unquoted command-line arguments
@@ -141,6 +141,17 @@ class EnvCharsData:
         escape = self.escape
         self.escape_map: dict[int, Any] | None = None
 
+        # Create translation table for the characters that should be
+        # escaped inside normal quotes: the escape itself and the quote
+
+        self.quote_map: dict[int, Any] | None = None
+
+        if escape and self.normal_quote:
+            self.quote_map = str.maketrans({
+                escape: f"{escape}{escape}",
+                self.normal_quote: f"{escape}{self.normal_quote}",
+            })
+
         if escape:
             self.escape_map = str.maketrans({
                 " ": f"{escape} ",
@@ -156,6 +167,30 @@ class EnvCharsData:
 
     ###########################################################################
 
+    @staticmethod
+    @lru_cache(maxsize=CMD_OPS_RE_CACHE_SIZE)
+    def __compile_cmd_ops(cmd_ops: str) -> re.Pattern[str]:
+        """
+        Compile regex splitting a command by any sequence of `cmd_ops`. As
+        every `copy_with()` creates a new instance with mostly the same
+        operators, the result is memoized.
+
+        :param cmd_ops: Command operators to split by
+        :type cmd_ops: ``str``
+
+        :return: Compiled regex with a capturing group around operators
+        :rtype: ``re.Pattern[str]``
+        """
+
+        pat_str = "|".join([f"{re.escape(c)}+" for c in cmd_ops])
+
+        # The from-character is escaped already
+        pat_str = pat_str.replace(EnvCharsData.DEFAULT_CMD_OPS, r"s")
+
+        return re.compile(rf"({pat_str})")
+
+    ###########################################################################
+
     def copy_with(
         self,
         is_posix: bool | None = None,
@@ -214,9 +249,9 @@ class EnvCharsData:
         last_no = -1
 
         for x in fully_split:
-            curr_is_ampers = True if x == "&" else False
+            curr_is_ampers = x == "&"
             curr_is_digits = EnvCharsData.DIGITS_ONLY_RE.search(x) is not None
-            curr_is_redir = True if x in "<>" else False
+            curr_is_redir = x in "<>"
 
             can_glue = (
                 (prev_is_digits and curr_is_redir)
@@ -44,10 +44,11 @@ class EnvFile:
     """End-of-file character (`\\x1A`) used to delimit adjacent files in concatenated content"""
 
     RE_KEY_VALUE: ClassVar[re.Pattern[str]] = re.compile(r"\s*=\s*")
-    """Regex to split a string into key and value"""
+    """Regex to split a string into key and value (`load_from_str()` gets
+    the same result via `str.partition()`)"""
 
-    __loaded: list[str] = []
-    """Internal list of files that were loaded already"""
+    __loaded: set[str] = set()
+    """Internal set of files that were loaded already"""
 
     ###########################################################################
 
@@ -91,17 +92,24 @@ class EnvFile:
         filters_ex: list[EnvFilter] = []
         plat_flags = EnvPlatformFlags.NONE
 
-        # Add the platforms filter before the other ones (if required)
+        # Build the platforms filter once, as it might be added twice
 
-        if flags & EnvFileFlags.ADD_PLATFORMS_BEFORE:
-            filters_ex.append(
-                EnvFilter(
-                    indicator,
-                    cur_values=Env.get_cur_platforms(plat_flags),
-                    all_values=Env.get_all_platforms(plat_flags),
-                )
+        plat_filter: EnvFilter | None = None
+
+        if flags & (
+            EnvFileFlags.ADD_PLATFORMS_BEFORE | EnvFileFlags.ADD_PLATFORMS_AFTER
+        ):
+            plat_filter = EnvFilter(
+                indicator,
+                cur_values=Env.get_cur_platforms(plat_flags),
+                all_values=Env.get_all_platforms(plat_flags),
             )
 
+        # Add the platforms filter before the other ones (if required)
+
+        if plat_filter and (flags & EnvFileFlags.ADD_PLATFORMS_BEFORE):
+            filters_ex.append(plat_filter)
+
         # Append the filters passed as separate arguments
 
         if filters:
@@ -113,14 +121,8 @@ class EnvFile:
 
         # Add the platforms filter  after the other ones (if required)
 
-        if flags & EnvFileFlags.ADD_PLATFORMS_AFTER:
-            filters_ex.append(
-                EnvFilter(
-                    indicator,
-                    cur_values=Env.get_cur_platforms(plat_flags),
-                    all_values=Env.get_all_platforms(plat_flags),
-                )
-            )
+        if plat_filter and (flags & EnvFileFlags.ADD_PLATFORMS_AFTER):
+            filters_ex.append(plat_filter)
 
         # Fallback: append a minimal set of filters if no other filter
         # already added
@@ -128,17 +130,22 @@ class EnvFile:
         if len(filters_ex) <= 0:
             filters_ex.append(EnvFilter())
 
-        # Grab filenames of all files in the given directory
+        # Grab names of all entries in the given directory: unlike
+        # Path.iterdir(), os.scandir() yields the names without creating
+        # a Path object per entry
 
-        file_names = [entry.name for entry in dir.iterdir() if entry.is_file()]
+        with os.scandir(dir) as entries:
+            entry_map = {entry.name: entry for entry in entries}
 
-        # Filter and sort filenames
+        # Filter and sort names
 
-        file_names = EnvFilters.process(file_names, filters_ex)
+        file_names = EnvFilters.process(list(entry_map), filters_ex)
 
-        # Return paths to the files filtered and sorted above
+        # Return paths to the actual files among the names filtered and sorted
+        # above: is_file() might need stat() on some file systems, so it is
+        # called for the matching names only
 
-        return [dir / file_name for file_name in file_names]
+        return [dir / x for x in file_names if entry_map[x].is_file()]
 
     ###########################################################################
 
@@ -207,17 +214,28 @@ class EnvFile:
         :type expand_flags: `EnvExpandFlags`
         """
 
-        # Split data into lines and loop through every line
-
-        environ = os.environ
+        # Nothing to assign without a single key-value separator: skip
+        # splitting into lines (e.g. comment-only files)
 
-        if data is None:
+        if (data is None) or ("=" not in data):
             return
 
+        # Apply every value to os.environ right away: the next lines as well
+        # as sub-processes they run should see it. Still, skip the values
+        # that did not change, as every assignment calls putenv()
+
+        environ = os.environ
+
         chars = EnvChars.Current
         is_eof = True
 
-        for line in data.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        # Split data into lines and loop through every line: unlike
+        # str.splitlines(), break at CR and LF only, so characters like
+        # form feed or the Unicode line separator stay in the value
+
+        lines = data.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+        for line in lines:
             # Remove all leading and trailing whitespaces
 
             line = line.strip()
@@ -242,23 +260,29 @@ class EnvFile:
                 if is_found:
                     continue
 
-            # Break into key and value and skip if can't do that
+            # Break into key and value and skip if can't do that: same as
+            # splitting by RE_KEY_VALUE once, but without the regex engine
 
-            parts = EnvFile.RE_KEY_VALUE.split(line, maxsplit=1)
+            key, sep, val = line.partition("=")
 
-            if len(parts) < 2:
+            if not sep:
                 continue
 
-            key, val = parts
+            key = key.rstrip()
 
             if not key:
                 continue
 
-            # Expand the value and add to the dict of environment variables
+            val = val.lstrip()
+
+            # Expand the value and set or remove the environment variable
 
             if val:
-                expanded = Env.expand(val, args=args, flags=expand_flags, chars=chars)
-                environ[key] = str(expanded)
+                expanded = str(
+                    Env.expand(val, args=args, flags=expand_flags, chars=chars)
+                )
+                if environ.get(key) != expanded:
+                    environ[key] = expanded
             elif key in environ:
                 del environ[key]
 
@@ -287,13 +311,22 @@ class EnvFile:
         # If required, discard information about the files already loaded
 
         if flags & EnvFileFlags.RESET_ACCUMULATED:
-            EnvFile.__loaded = []
+            EnvFile.__loaded = set()
 
-        # Accumulate the content
+        # Accumulate the content, tracking files by absolute paths, so the
+        # same file is not loaded twice via a relative and an absolute path;
+        # the current directory is fetched only once, and only if needed
+
+        cur_dir: str | None = None
 
         for file in files:
             file_str = str(file)
 
+            if not os.path.isabs(file_str):
+                if cur_dir is None:
+                    cur_dir = os.getcwd()
+                file_str = os.path.join(cur_dir, file_str)
+
             # If the file of that path was loaded already, skip it
 
             if file_str in EnvFile.__loaded:
@@ -301,7 +334,7 @@ class EnvFile:
 
             # Avoid multiple loads of the same file
 
-            EnvFile.__loaded.append(file_str)
+            EnvFile.__loaded.add(file_str)
 
             # Read the file content ignoring any issue
 
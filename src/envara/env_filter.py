@@ -5,6 +5,7 @@
 ###############################################################################
 
 
+from functools import lru_cache
 import re
 from typing import ClassVar
 
@@ -14,6 +15,9 @@ from typing import ClassVar
 
 
 class EnvFilter:
+    __slots__ = ("indicator", "cur_values", "all_values")
+    """Instance attributes: no per-instance `__dict__` needed"""
+
     DEFAULT_RE_FLAGS: ClassVar[re.RegexFlag] = re.RegexFlag.IGNORECASE
     """Default regex flags to compile with"""
 
@@ -23,6 +27,9 @@ class EnvFilter:
     DEFAULT_STRIP_RE: ClassVar[re.Pattern[str]] = re.compile(r"^\s+|\s*(,)\s*|\s+$")
     """Regex to strip all unnecessary blanks around every delimited field"""
 
+    VALUES_RE_CACHE_SIZE: ClassVar[int] = 64
+    """Maximum number of value alternations memoized by `search()`"""
+
     VALUE_SEPARATORS: ClassVar[str] = ".-_"
     """Any of these characters separates values in an input string"""
 
@@ -147,6 +154,65 @@ class EnvFilter:
 
     ###########################################################################
 
+    @staticmethod
+    @lru_cache(maxsize=VALUES_RE_CACHE_SIZE)
+    def __get_values_re(
+        values: tuple[str, ...],
+        separators: str,
+    ) -> re.Pattern[str] | None:
+        """
+        Compile a single alternation of `values`, each one bounded by
+        `separators` or the edges of the input like in `has_value()`. Every
+        value gets its own capturing group (an empty value gets a
+        never-matching one), so `match.lastindex` is the 1-based index of
+        the value found. The whole alternation sits in a lookahead, hence
+        `finditer()` tries it at every position, even inside another match.
+
+        This is on purpose broader than `has_value()`, which resumes its
+        scan after the end of an unbounded occurrence: any bounded
+        occurrence counts, so `"x.x"` is found in `"yx.x.x"` at position 3,
+        although it overlaps the unbounded one at position 1.
+
+        :param values: Values to combine
+        :type values: `tuple[str, ...]`
+
+        :param separators: Characters separating values in an input string
+        :type separators: `str`
+
+        :return: Compiled regex or `None` if there is nothing to match
+        :rtype: `re.Pattern[str] | None`
+        """
+
+        if not any(values):
+            return None
+
+        alts = "|".join(f"({re.escape(x)})" if x else "((?!))" for x in values)
+        non_sep = f"[^{re.escape(separators)}]" if separators else r"[\s\S]"
+
+        return re.compile(f"(?<!{non_sep})(?=(?:{alts})(?!{non_sep}))")
+
+    ###########################################################################
+
+    @staticmethod
+    def __has_any_substr(input: str, values: list[str]) -> bool:
+        """
+        Cheap pre-check for `search()`: whether any non-empty value occurs
+        in `input` at all, regardless of separators
+
+        :param input: String to look for values in
+        :type input: `str`
+
+        :param values: Values to look for
+        :type values: `list[str]`
+
+        :return: `True` if at least one value is a substring of `input`
+        :rtype: `bool`
+        """
+
+        return any(x and (x in input) for x in values)
+
+    ###########################################################################
+
     def search(
         self,
         input: str | None,
@@ -180,31 +246,39 @@ class EnvFilter:
         else:
             return -1
 
-        # Initialize cur_values count as well as index related to position
-        # in the cur_values list
-
-        cur_index = 0
-        found_index = -1
-
-        # Find the first matching value
+        # Find the first matching value in a single regex pass: every match
+        # holds the lowest index of the values found at its position. Skip
+        # the regex engine unless some value occurs as a plain substring
 
         if not self.cur_values:
             return -1
 
-        for x in self.cur_values:
-            cur_index = cur_index + 1
-            if EnvFilter.has_value(input, x)[0]:
-                found_index = cur_index
-                break
+        separators = EnvFilter.VALUE_SEPARATORS
+
+        if EnvFilter.__has_any_substr(input, self.cur_values):
+            cur_re = EnvFilter.__get_values_re(tuple(self.cur_values), separators)
+        else:
+            cur_re = None
 
-        # If the first matching value found return respective index
+        if cur_re is not None:
+            found_index = min(
+                (m.lastindex or 0 for m in cur_re.finditer(input)), default=0
+            )
 
-        if found_index >= 0:
-            return found_index
+            # If the first matching value found return respective index
+
+            if found_index > 0:
+                return found_index
 
         # Check whether input is in scope at all
 
-        in_scope = any(EnvFilter.has_value(input, x)[0] for x in self.all_values or [])
+        all_values = self.all_values or []
+
+        if EnvFilter.__has_any_substr(input, all_values):
+            all_re = EnvFilter.__get_values_re(tuple(all_values), separators)
+            in_scope = (all_re is not None) and (all_re.search(input) is not None)
+        else:
+            in_scope = False
 
         # If input is not in scope, then top match. Otherwise, not found
 
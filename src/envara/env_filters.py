@@ -4,8 +4,6 @@
 # Environment-related filtering helpers (mainly, for EnvFile)
 ###############################################################################
 
-from functools import cmp_to_key
-
 from envara.env_filter import EnvFilter
 
 ###############################################################################
@@ -39,12 +37,14 @@ class EnvFilters:
         if (not filters) or (not input) or (len(input) <= 0):
             return input
 
-        # Initialize the output list
+        # Initialize the output list of (reversed indices, item) pairs
 
-        filtered: list[str] = []
-        indices: dict[str, list[int]] = {}
+        filtered: list[tuple[tuple[int, ...], str]] = []
 
-        # Accumulate indices of all relevant items from the input
+        # Accumulate all relevant items from the input along with their
+        # sort keys: indices found by the last filter matter most, the item
+        # itself breaks any tie; so the sort is a plain tuple comparison in C
+        # rather than a Python comparer call per pair of items
 
         for item in input:
             is_match = True
@@ -58,33 +58,14 @@ class EnvFilters:
                 item_indices.append(i)
 
             if is_match:
-                filtered.append(item)
-                indices[item] = item_indices
-
-        # Define complex comparer for sorting
-
-        def compare_items(item1: str, item2: str):
-            indices_1 = indices[item1]
-            indices_2 = indices[item2]
-
-            i1 = len(indices_2)
-            i2 = len(indices_2)
-
-            while i1 > 0:
-                i1 = i1 - 1
-                i2 = i2 - 1
-                dif = indices_1[i1] - indices_2[i2]
-                if dif != 0:
-                    return dif
-
-            if item1 < item2:
-                return -1
-
-            return 0 if item1 == item2 else 1
+                item_indices.reverse()
+                filtered.append((tuple(item_indices), item))
 
         # Sort the filtered items and return
 
-        return sorted(filtered, key=cmp_to_key(compare_items))
+        filtered.sort()
+
+        return [x[1] for x in filtered]
 
 
 ###############################################################################
@@ -37,6 +37,32 @@ def mock_platform():
                 )
 
 
+@pytest.fixture
+def env_sandbox(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    """Swap os.environ for a plain dict, restored by monkeypatch on teardown"""
+    sandbox: dict[str, str] = {}
+    monkeypatch.setattr(os, "environ", sandbox)
+    return sandbox
+
+
+@pytest.fixture
+def mock_scandir(mocker):
+    """Patch os.scandir with a factory building file entries from names"""
+
+    def _make(*names: str) -> list:
+        entries = []
+        for name in names:
+            entry = mocker.MagicMock()
+            entry.name = name
+            entry.is_file.return_value = True
+            entries.append(entry)
+        scandir = mocker.patch("os.scandir")
+        scandir.return_value.__enter__.return_value = entries
+        return entries
+
+    return _make
+
+
 @pytest.fixture
 def mock_windows_paths():
     """Mock os.path functions for Windows path slicing tests"""
@@ -5,17 +5,19 @@ from pytest_mock import MockerFixture
 from tests.conftest import env_chars_mod, env_chars_data_mod
 
 
-def _get_envchars(
-    is_posix: bool = False,
-    is_vms: bool = False,
-    is_windows: bool = False,
-):
-    x = env_chars_mod.EnvChars
-    x.IS_POSIX = is_posix
-    x.IS_VMS = is_vms
-    x.IS_WINDOWS = is_windows
-    x.Default = x.init_default()
-    return x
+@pytest.fixture
+def get_envchars(monkeypatch: pytest.MonkeyPatch):
+    """Set EnvChars platform flags and Default, restored by monkeypatch on teardown"""
+
+    def _get(is_posix: bool = False, is_vms: bool = False, is_windows: bool = False):
+        x = env_chars_mod.EnvChars
+        monkeypatch.setattr(x, "IS_POSIX", is_posix)
+        monkeypatch.setattr(x, "IS_VMS", is_vms)
+        monkeypatch.setattr(x, "IS_WINDOWS", is_windows)
+        monkeypatch.setattr(x, "Default", x.init_default())
+        return x
+
+    return _get
 
 
 class TestEnvCharsConstants:
@@ -63,8 +65,10 @@ class TestEnvCharsConstants:
             ),
         ],
     )
-    def test_platform_is_envcharsdata(self, name: str, expected_attrs: Any):
-        EnvChars = _get_envchars()
+    def test_platform_is_envcharsdata(
+        self, get_envchars, name: str, expected_attrs: Any
+    ):
+        EnvChars = get_envchars()
         platform = getattr(EnvChars, name)
         assert platform is not None
         assert isinstance(platform, env_chars_data_mod.EnvCharsData)  # type: ignore[attr-defined]
@@ -80,53 +84,55 @@ class TestEnvCharsDataAttrs:
             ("WINDOWS", "%"),
         ],
     )
-    def test_platform_expand(self, platform: str, expected_expand: str):
-        EnvChars = _get_envchars()
+    def test_platform_expand(self, get_envchars, platform: str, expected_expand: str):
+        EnvChars = get_envchars()
         assert getattr(EnvChars, platform).expand == expected_expand
 
-    def test_select_init_default_when_not_set(self):
+    def test_select_init_default_when_not_set(self, monkeypatch: pytest.MonkeyPatch):
         EnvChars = env_chars_mod.EnvChars
-        EnvChars.Default = EnvChars.POSIX
-        EnvChars.Current = EnvChars.Default
+        monkeypatch.setattr(EnvChars, "Default", EnvChars.POSIX)
+        monkeypatch.setattr(EnvChars, "Current", EnvChars.Default)
         result = EnvChars.select("test")
         assert result is not None
         assert EnvChars.Default is not None
 
 
 class TestEnvCharsMethods:
-    def test_init_sets_default(self):
-        EnvChars = _get_envchars()
+    def test_init_sets_default(self, get_envchars):
+        EnvChars = get_envchars()
         assert EnvChars.Current is not None
         assert EnvChars.Default is not None
 
-    def test_init_with_existing_default_skips_init(self):
-        EnvChars = _get_envchars()
+    def test_init_with_existing_default_skips_init(self, get_envchars):
+        EnvChars = get_envchars()
         EnvChars.select("")
         assert EnvChars.Default is not None
         original = EnvChars.Default
         assert EnvChars.Default is original
 
-    def test_select_with_vms_cutter(self):
-        EnvChars = _get_envchars()
+    def test_select_with_vms_cutter(self, get_envchars):
+        EnvChars = get_envchars()
         EnvChars.select("!test")
         assert EnvChars.Current.expand == "'"
 
-    def test_select_with_windows_cutter(self):
-        EnvChars = _get_envchars()
+    def test_select_with_windows_cutter(self, get_envchars):
+        EnvChars = get_envchars()
         EnvChars.select("::test")
         assert EnvChars.Current.expand == "%"
 
 
 class TestEnvCharsSelect:
-    def test_select_copies_constants(self):
-        EnvChars = _get_envchars(is_posix=True)
+    def test_select_copies_constants(self, get_envchars):
+        EnvChars = get_envchars(is_posix=True)
         EnvChars.select("test")
 
         assert EnvChars.Default is not EnvChars.POSIX
         assert EnvChars.Current is not EnvChars.POSIX
 
-    def test_select_sets_current_based_on_comment(self, mocker: MockerFixture):
-        EnvChars = _get_envchars(is_posix=True)
+    def test_select_sets_current_based_on_comment(
+        self, get_envchars, mocker: MockerFixture
+    ):
+        EnvChars = get_envchars(is_posix=True)
         EnvChars.select("# test")
 
         assert EnvChars.Current is not None
@@ -142,20 +148,21 @@ class TestEnvCharsSelect:
     )
     def test_select_sets_default_based_on_platform(
         self,
+        get_envchars,
         mocker: MockerFixture,
         is_posix: bool,
         is_vms: bool,
         is_windows: bool,
         expected_expand: str,
     ):
-        EnvChars = _get_envchars(is_posix, is_vms, is_windows)
+        EnvChars = get_envchars(is_posix, is_vms, is_windows)
         EnvChars.select("test")
 
         assert EnvChars.Default is not None
         assert EnvChars.Default.expand == expected_expand
 
-    def test_select_with_empty_string(self):
-        EnvChars = _get_envchars(is_posix=True)
+    def test_select_with_empty_string(self, get_envchars):
+        EnvChars = get_envchars(is_posix=True)
         EnvChars.select("")
 
         assert EnvChars.Current is not None
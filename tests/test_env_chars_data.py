@@ -30,6 +30,24 @@ class TestEnvCharsDataAttributes:
         assert info.all_quotes == expected_all_quotes
         assert info.all_quotes_len == expected_len
 
+    @pytest.mark.parametrize(
+        "escape,normal_quote,input_str,expected",
+        [
+            ("\\", '"', 'a\\"b', 'a\\\\\\"b'),
+            ("^", '"', 'a^"b', 'a^^^"b'),
+            ("", '"', None, None),
+            ("\\", "", None, None),
+        ],
+    )
+    def test_quote_map(
+        self, escape: str, normal_quote: str, input_str: str | None, expected: str
+    ):
+        info = _make_envcharsdata(escape=escape, normal_quote=normal_quote)
+        if input_str is None:
+            assert info.quote_map is None
+        else:
+            assert input_str.translate(info.quote_map) == expected
+
 
 class TestEnvCharsDataConstructor:
     @pytest.mark.parametrize(
@@ -262,6 +280,11 @@ class TestEnvCharsDataCmdOps:
         inner = info.cmd_ops_re.pattern
         assert pat_substr in inner
 
+    def test_cmd_ops_re_shared_by_copies(self):
+        info = _make_envcharsdata(expand="$", cmd_ops=" |")
+        assert info.copy_with(expand="%").cmd_ops_re is info.cmd_ops_re
+        assert info.copy_with(cmd_ops="&").cmd_ops_re is not info.cmd_ops_re
+
 
 class TestEnvCharsDataSplitGlued:
     @pytest.mark.parametrize(
@@ -2,7 +2,6 @@ import re
 import os
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock
 
 from pytest import MonkeyPatch
 from pytest_mock import MockerFixture
@@ -27,6 +26,12 @@ EnvCharsData = env_chars_data_mod.EnvCharsData
 EnvChars = env_chars_mod.EnvChars
 
 
+@pytest.fixture(autouse=True)
+def fresh_loaded(monkeypatch: MonkeyPatch):
+    """Give each test an empty set of loaded files, restored afterwards"""
+    monkeypatch.setattr(EnvFile, "_EnvFile__loaded", set())
+
+
 class TestEnvFileConstants:
     def test_default_expand_flags_has_remove_line_comment(self):
         assert EnvFile.DEFAULT_EXPAND_FLAGS & EnvExpandFlags.STRIP_COMMENT
@@ -34,34 +39,29 @@ class TestEnvFileConstants:
     def test_default_file_flags_none(self):
         assert EnvFileFlags.NONE == 0
 
-    def test_loaded_list_initially_empty(self):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        assert EnvFile._EnvFile__loaded == []  # type: ignore
+    def test_loaded_set_initially_empty(self):
+        assert EnvFile._EnvFile__loaded == set()  # type: ignore
 
     def test_re_key_value_is_compiled(self):
         assert isinstance(EnvFile.RE_KEY_VALUE, re.Pattern)
 
 
 class TestEnvFileGetFiles:
-    def test_get_files_empty_dir(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-
-        result = EnvFile.get_files(Path("/empty"), "env", EnvFileFlags.NONE)
+    def test_get_files_empty_dir(self, tmp_path: Path):
+        result = EnvFile.get_files(tmp_path, "env", EnvFileFlags.NONE)
 
         assert result == []
 
-    def test_get_files_returns_list(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
+    def test_get_files_returns_list(self, tmp_path: Path, mocker: MockerFixture):
+        mocker.patch.object(Env, "get_cur_platforms", return_value=["posix"])
+        mocker.patch.object(Env, "get_all_platforms", return_value=["posix", "windows"])
+        (tmp_path / "app").write_text("")
+        (tmp_path / "app.posix").write_text("")
+        (tmp_path / "app.windows").write_text("")
 
-        result = EnvFile.get_files(
-            Path("/etc"), "app", EnvFileFlags.ADD_PLATFORMS_BEFORE
-        )
+        result = EnvFile.get_files(tmp_path, "app", EnvFileFlags.ADD_PLATFORMS_BEFORE)
 
-        assert isinstance(result, list)
+        assert result == [tmp_path / "app", tmp_path / "app.posix"]
 
     def test_get_files_public_api(self):
         assert hasattr(EnvFile, "get_files")
@@ -69,154 +69,123 @@ class TestEnvFileGetFiles:
 
 
 class TestEnvFileGetFilesMocked:
-    def test_get_files_with_mock(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
+    def test_get_files_with_mock(self, mocker: MockerFixture, mock_scandir):
+        mock_scandir()
         mock_path = mocker.MagicMock()
-        mock_path.iterdir.return_value = []
         result = EnvFile.get_files(mock_path, "env", EnvFileFlags.NONE)
         assert isinstance(result, list)
 
 
-class TestEnvFileGetFilesPlatforms:
-    def test_get_files_adds_platforms_after(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(Env, "get_cur_platforms", return_value=["linux"])
-        mocker.patch.object(Env, "get_all_platforms", return_value=["linux", "windows"])
-        mocker.patch.object(EnvFilters, "process", return_value=[])
-
-        result = EnvFile.get_files(
-            Path("/test"), "env", EnvFileFlags.ADD_PLATFORMS_AFTER
-        )
+SHAPE_FILTER = EnvFilter("env")
+SHAPE_PROD_FILTER = EnvFilter("env", cur_values=["prod"])
+SHAPE_PLAT_FILTER = EnvFilter(
+    "env", cur_values=["linux"], all_values=["linux", "windows"]
+)
 
-        assert isinstance(result, list)
 
-    def test_get_files_adds_platforms_before(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
+class TestEnvFileGetFilesShape:
+    @pytest.mark.parametrize(
+        "indicator,flags,filters,expected",
+        [
+            ("env", EnvFileFlags.NONE, (), [EnvFilter()]),
+            (None, EnvFileFlags.NONE, (), [EnvFilter()]),
+            ("env", EnvFileFlags.NONE, ([],), [EnvFilter()]),
+            ("env", EnvFileFlags.NONE, (None,), [EnvFilter()]),
+            ("env", EnvFileFlags.NONE, ([SHAPE_FILTER],), [SHAPE_FILTER]),
+            (
+                "env",
+                EnvFileFlags.NONE,
+                (SHAPE_FILTER, SHAPE_PROD_FILTER),
+                [SHAPE_FILTER, SHAPE_PROD_FILTER],
+            ),
+            ("env", EnvFileFlags.ADD_PLATFORMS_BEFORE, (), [SHAPE_PLAT_FILTER]),
+            ("env", EnvFileFlags.ADD_PLATFORMS_AFTER, (), [SHAPE_PLAT_FILTER]),
+            (
+                "env",
+                EnvFileFlags.ADD_PLATFORMS_BEFORE | EnvFileFlags.ADD_PLATFORMS_AFTER,
+                (),
+                [SHAPE_PLAT_FILTER, SHAPE_PLAT_FILTER],
+            ),
+            (
+                "env",
+                EnvFileFlags.ADD_PLATFORMS_BEFORE,
+                (SHAPE_PROD_FILTER,),
+                [SHAPE_PLAT_FILTER, SHAPE_PROD_FILTER],
+            ),
+            (
+                "env",
+                EnvFileFlags.ADD_PLATFORMS_AFTER,
+                ([SHAPE_PROD_FILTER],),
+                [SHAPE_PROD_FILTER, SHAPE_PLAT_FILTER],
+            ),
+        ],
+    )
+    def test_get_files(
+        self,
+        mocker: MockerFixture,
+        mock_scandir,
+        indicator: str | None,
+        flags: EnvFileFlags,
+        filters: tuple,
+        expected: list,
+    ):
+        mock_scandir()
         mocker.patch.object(Env, "get_cur_platforms", return_value=["linux"])
-        mocker.patch.object(
-            Env, "get_all_platforms", return_value=["linux", "windows", "darwin"]
-        )
-        mocker.patch.object(EnvFilters, "process", return_value=[])
+        mocker.patch.object(Env, "get_all_platforms", return_value=["linux", "windows"])
+        mock_process = mocker.patch.object(EnvFilters, "process", return_value=[])
 
-        result = EnvFile.get_files(
-            Path("/test"), "env", EnvFileFlags.ADD_PLATFORMS_BEFORE
-        )
+        result = EnvFile.get_files(Path("/test"), indicator, flags, *filters)
 
-        assert isinstance(result, list)
+        assert result == []
+        assert mock_process.call_args.args[1] == expected
 
-    def test_get_files_both_before_and_after(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(Env, "get_cur_platforms", return_value=["linux"])
-        mocker.patch.object(Env, "get_all_platforms", return_value=["linux", "windows"])
-        mocker.patch.object(EnvFilters, "process", return_value=[])
+    def test_get_files_builds_platform_filter_once(
+        self, mocker: MockerFixture, mock_scandir
+    ):
+        mock_scandir()
+        mock_cur = mocker.patch.object(Env, "get_cur_platforms", return_value=["linux"])
+        mock_all = mocker.patch.object(Env, "get_all_platforms", return_value=["linux"])
+        mock_process = mocker.patch.object(EnvFilters, "process", return_value=[])
 
-        result = EnvFile.get_files(
+        EnvFile.get_files(
             Path("/test"),
             "env",
             EnvFileFlags.ADD_PLATFORMS_BEFORE | EnvFileFlags.ADD_PLATFORMS_AFTER,
         )
 
-        assert isinstance(result, list)
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(EnvFilters, "process", return_value=["test.env"])
+        mock_cur.assert_called_once()
+        mock_all.assert_called_once()
+        filters = mock_process.call_args.args[1]
+        assert filters[0] is filters[1]
 
-        f = EnvFilter("env")
-        result = EnvFile.get_files(Path("/test"), "env", EnvFileFlags.NONE, [f])
+    def test_get_files_returns_paths_from_filtered_names(self, tmp_path: Path):
+        (tmp_path / ".env").write_text("")
+        (tmp_path / "test.env").write_text("")
 
-        assert isinstance(result, list)
+        result = EnvFile.get_files(tmp_path, "env", EnvFileFlags.NONE)
 
-    def test_get_files_fallback_to_default_filter(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(EnvFilters, "process", return_value=[])
+        assert result == [tmp_path / ".env"]
 
-        result = EnvFile.get_files(Path("/test"), None, EnvFileFlags.NONE)
-
-        assert result == []
-
-    def test_get_files_returns_paths_from_filtered_names(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_entry = mocker.MagicMock()
-        mock_entry.name = "test.env"
-        mock_entry.is_file.return_value = True
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = [mock_entry]
-        mocker.patch.object(EnvFilters, "process", return_value=["test.env"])
+    def test_get_files_checks_is_file_for_matches_only(self, mock_scandir):
+        entries = mock_scandir(".env", "readme.txt", "main.py")
 
         result = EnvFile.get_files(Path("/test"), "env", EnvFileFlags.NONE)
 
-        assert len(result) >= 0
-
-    def test_get_files_skips_non_files(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_entry = mocker.MagicMock()
-        mock_entry.name = "app.env"
-        mock_entry.is_file.return_value = False
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = [mock_entry]
-        mocker.patch.object(EnvFilters, "process", return_value=[])
-
-        result = EnvFile.get_files(Path("/test"), "app", EnvFileFlags.NONE)
-
-        assert result == []
-
-    def test_get_files_with_empty_filter_list(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(EnvFilters, "process", return_value=[])
-
-        result = EnvFile.get_files(Path("/test"), "env", EnvFileFlags.NONE, [])
+        assert result == [Path("/test/.env")]
+        entries[0].is_file.assert_called_once()
+        entries[1].is_file.assert_not_called()
+        entries[2].is_file.assert_not_called()
 
-        assert result == []
-
-    def test_get_files_with_filters_multiple(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(EnvFilters, "process", return_value=["test.env"])
-
-        f1 = EnvFilter("env")
-        f2 = EnvFilter("prod")
-        result = EnvFile.get_files(Path("/test"), "env", EnvFileFlags.NONE, f1, f2)
-
-        assert isinstance(result, list)
-
-    def test_get_files_with_none_filter(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(EnvFilters, "process", return_value=[])
+    def test_get_files_skips_non_files(self, tmp_path: Path):
+        (tmp_path / "app.env").mkdir()
 
-        result = EnvFile.get_files(Path("/test"), "env", EnvFileFlags.NONE, [])
-
-        assert result == []
-
-    def test_get_files_skips_falsy_filter(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(EnvFilters, "process", return_value=[])
-
-        result = EnvFile.get_files(Path("/test"), "env", EnvFileFlags.NONE, None)
+        result = EnvFile.get_files(tmp_path, "app", EnvFileFlags.NONE)
 
         assert result == []
 
 
+@pytest.mark.usefixtures("env_sandbox")
 class TestEnvFileLoad:
-    def test_get_files_public_api(self):
-        assert hasattr(EnvFile, "get_files")
-        assert callable(EnvFile.get_files)
-
     def test_load_method_gets_files(self, mocker: MockerFixture):
         mock_get_files = mocker.patch.object(EnvFile, "get_files", return_value=[])
         mocker.patch.object(EnvFile, "read_text", return_value="")
@@ -235,14 +204,18 @@ class TestEnvFileLoad:
 
         mock_read_text.assert_called_once()
 
+    def test_load_from_str_applies_colon_equals_before_error(
+        self, env_sandbox: dict[str, str]
+    ):
+        with pytest.raises(ValueError, match="parameter null or not set"):
+            EnvFile.load_from_str("AA=${BB:=hello}${CC:?}")
+        assert env_sandbox["BB"] == "hello"
+        assert "AA" not in env_sandbox
+
     def test_load_public_api(self):
         assert hasattr(EnvFile, "load")
         assert callable(EnvFile.load)
 
-    def test_read_text_public_api(self):
-        assert hasattr(EnvFile, "read_text")
-        assert callable(EnvFile.read_text)
-
     def test_load_from_str_public_api(self):
         assert hasattr(EnvFile, "load_from_str")
         assert callable(EnvFile.load_from_str)
@@ -283,11 +256,27 @@ class TestEnvFileLoad:
         EnvFile.load_from_str("  KEY  =value")
         assert os.environ.get("KEY") == "value"
 
-    def test_load_from_str_with_cr_lf(self):
-        EnvFile.load_from_str("KEY1=value1\r\nKEY2=value2")
+    @pytest.mark.parametrize(
+        "data",
+        [
+            "KEY1=value1\r\nKEY2=value2",
+            "KEY1=value1\rKEY2=value2",
+            "KEY1=value1\r\rKEY2=value2\n",
+            "KEY1=value1\n\r\nKEY2=value2\r",
+        ],
+    )
+    def test_load_from_str_with_cr(self, data: str):
+        EnvFile.load_from_str(data)
+        assert os.environ["KEY1"] == "value1"
+        assert os.environ["KEY2"] == "value2"
 
-    def test_load_from_str_with_cr_only(self):
-        EnvFile.load_from_str("KEY1=value1\rKEY2=value2")
+    @pytest.mark.parametrize("char", ["\v", "\f", "\x1c", "\x85", "\u2028"])
+    def test_load_from_str_keeps_other_line_breaks_in_value(self, char: str):
+        EnvFile.load_from_str(
+            f"KEY1=a{char}b\nKEY2=value2", expand_flags=EnvExpandFlags.NONE
+        )
+        assert os.environ["KEY1"] == f"a{char}b"
+        assert os.environ["KEY2"] == "value2"
 
     def test_load_from_str_with_custom_args(self):
         EnvFile.load_from_str("KEY=$1", args=["arg1"])
@@ -315,121 +304,245 @@ class TestEnvFileLoad:
         EnvFile.load_from_str("no_equals")
         assert len(os.environ) == old_len
 
+    def test_load_from_str_without_any_equals_skips_parsing(
+        self, mocker: MockerFixture
+    ):
+        mock_select = mocker.patch.object(EnvFile, "select_chars")
+        EnvFile.load_from_str("# comment\n\nno_equals\n")
+        mock_select.assert_not_called()
+
     def test_load_from_str_without_key(self):
         old_len: int = len(os.environ)
         EnvFile.load_from_str("=value")
         assert len(os.environ) == old_len
 
     def test_load_from_str_eof_separator_switches_platform(self):
-        KEY1 = "KEY1"
-        KEY2 = "KEY2"
-        try:
-            data = f"{KEY1}=value1\n\x1a\n{KEY2}=value2"
-            EnvFile.load_from_str(data)
-            assert os.environ.get(KEY1) == "value1"
-            assert os.environ.get(KEY2) == "value2"
-        finally:
-            os.environ.pop(KEY1, None)
-            os.environ.pop(KEY2, None)
-
-
-class TestEnvFileLoadedList:
-    def test_loaded_list_accessible(self):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        assert EnvFile._EnvFile__loaded == []  # type: ignore
-
-    def test_loaded_list_append(self):
-        original: list[str] = (  # type: ignore
-            EnvFile._EnvFile__loaded.copy()  # type: ignore
-            if hasattr(EnvFile, "_EnvFile__loaded") and EnvFile._EnvFile__loaded  # type: ignore
-            else []
+        EnvFile.load_from_str("KEY1=value1\n\x1a\nKEY2=value2")
+        assert os.environ.get("KEY1") == "value1"
+        assert os.environ.get("KEY2") == "value2"
+
+    @pytest.mark.parametrize(
+        "line",
+        ["KEY=a=b", "KEY = a=b", "KEY\t=\t a=b", "KEY  =a=b  "],
+    )
+    def test_load_from_str_splits_at_first_equals(self, line: str):
+        key, val = EnvFile.RE_KEY_VALUE.split(line.strip(), maxsplit=1)
+        EnvFile.load_from_str(line, expand_flags=EnvExpandFlags.NONE)
+        assert os.environ[key] == val == "a=b"
+
+    def test_load_from_str_skips_lines_without_equals(
+        self, env_sandbox: dict[str, str]
+    ):
+        EnvFile.load_from_str("no_equals\nKEY=value")
+        assert env_sandbox["KEY"] == "value"
+        assert "no_equals" not in env_sandbox
+
+    def test_load_from_str_skips_unchanged_values(self, monkeypatch: MonkeyPatch):
+        class Environ(dict[str, str]):
+            writes: list[str] = []
+
+            def __setitem__(self, key: str, value: str):
+                self.writes.append(key)
+                super().__setitem__(key, value)
+
+            def update(self, other: dict[str, str]):  # type: ignore
+                self.writes.extend(other)
+                super().update(other)
+
+        environ = Environ(KEY1="value1", KEY2="old")
+        monkeypatch.setattr(os, "environ", environ)
+
+        EnvFile.load_from_str("KEY1=value1\nKEY2=new")
+
+        assert environ == {"KEY1": "value1", "KEY2": "new"}
+        assert environ.writes == ["KEY2"]
+
+    def test_load_from_str_applies_changes_before_error(
+        self, env_sandbox: dict[str, str]
+    ):
+        with pytest.raises(ValueError, match="parameter null or not set"):
+            EnvFile.load_from_str("KEY1=value1\nKEY2=${UNSET_KEY:?}")
+        assert env_sandbox["KEY1"] == "value1"
+        assert "KEY2" not in env_sandbox
+
+    def test_load_from_str_colon_equals_sets_env(self, env_sandbox: dict[str, str]):
+        EnvFile.load_from_str("AA=${BB:=hello}\n")
+        assert env_sandbox["AA"] == env_sandbox["BB"] == "hello"
+
+    def test_load_from_str_deleted_key_reads_as_unset(
+        self, env_sandbox: dict[str, str]
+    ):
+        env_sandbox["KEY1"] = "value1"
+        EnvFile.load_from_str("KEY1=\nKEY2=${KEY1-unset}")
+        assert "KEY1" not in env_sandbox
+        assert env_sandbox["KEY2"] == "unset"
+
+    def test_load_from_str_looks_up_via_environ(self, monkeypatch: MonkeyPatch):
+        class Environ(dict[str, str]):
+            def __contains__(self, key: object) -> bool:
+                return super().__contains__(str(key).upper())
+
+            def __delitem__(self, key: str):
+                super().__delitem__(key.upper())
+
+            def __getitem__(self, key: str) -> str:
+                return super().__getitem__(key.upper())
+
+            def __setitem__(self, key: str, value: str):
+                super().__setitem__(key.upper(), value)
+
+            def get(self, key: str, default=None):  # type: ignore
+                return super().get(key.upper(), default)
+
+        environ = Environ(PATH="/bin", TEMP="/tmp")
+        monkeypatch.setattr(os, "environ", environ)
+
+        EnvFile.load_from_str("KEY1=$path\nPath=/usr/bin\nKEY2=$PATH\ntemp=")
+
+        assert dict(environ) == {"PATH": "/usr/bin", "KEY1": "/bin", "KEY2": "/usr/bin"}
+
+    def test_load_from_str_writes_to_sandbox(self, env_sandbox: dict[str, str]):
+        EnvFile.load_from_str("KEY1=value1\nKEY2=$KEY1")
+        assert env_sandbox["KEY1"] == "value1"
+        assert env_sandbox["KEY2"] == "value1"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX subprocess test")
+class TestEnvFileLoadSubprocess:
+    """Sub-processes inherit the real environment, so no sandbox here"""
+
+    def test_load_from_str_subprocess_sees_earlier_line(self, monkeypatch: MonkeyPatch):
+        monkeypatch.setenv("ENVARA_TEST_A", "")
+        monkeypatch.setenv("ENVARA_TEST_B", "")
+
+        EnvFile.load_from_str(
+            "ENVARA_TEST_A=hello\nENVARA_TEST_B=$(printenv ENVARA_TEST_A)\n"
         )
-        EnvFile._EnvFile__loaded = original + ["test"]  # type: ignore
-        assert "test" in EnvFile._EnvFile__loaded  # type: ignore
-        EnvFile._EnvFile__loaded = original  # type: ignore
 
+        assert os.environ["ENVARA_TEST_B"] == "hello"
 
-class TestEnvFilePlatformFlags:
-    def test_get_files_empty_dir_no_filters(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_iterdir = mocker.patch.object(Path, "iterdir")
-        mock_iterdir.return_value = []
-        mocker.patch.object(EnvFilters, "process", return_value=[])
+    def test_load_colon_equals_visible_to_subprocess(
+        self, tmp_path: Path, monkeypatch: MonkeyPatch
+    ):
+        for name in ("ENVARA_TEST_A", "ENVARA_TEST_B", "ENVARA_TEST_C"):
+            monkeypatch.setenv(name, "")
+            monkeypatch.delenv(name)
+        (tmp_path / ".env").write_text(
+            "ENVARA_TEST_A=${ENVARA_TEST_B:=hello}\n"
+            "ENVARA_TEST_C=$(printenv ENVARA_TEST_B)\n"
+        )
 
-        result = EnvFile.get_files(Path("/test"), "env", EnvFileFlags.NONE)
+        EnvFile.load(tmp_path, "env", EnvFileFlags.NONE)
 
-        assert result == []
+        assert os.environ["ENVARA_TEST_A"] == os.environ["ENVARA_TEST_B"] == "hello"
+        assert os.environ["ENVARA_TEST_C"] == "hello"
+
+
+class TestEnvFileLoadedSet:
+    def test_loaded_set_add(self):
+        EnvFile._EnvFile__loaded.add("test")  # type: ignore
+        assert "test" in EnvFile._EnvFile__loaded  # type: ignore
+
+    def test_loaded_set_ignores_duplicates(self, tmp_path: Path):
+        file = tmp_path / ".env"
+        file.write_text("KEY=value")
+
+        result = EnvFile.read_text([file, file], EnvFileFlags.NONE)
+
+        assert result == "KEY=value"
+        assert EnvFile._EnvFile__loaded == {str(file)}  # type: ignore
 
 
 class TestEnvFileReadText:
-    def test_read_text_empty(self, mocker: MockerFixture):
-        mock_path = MagicMock()
-        mock_path.read_text.return_value = ""
+    def test_read_text_empty(self, tmp_path: Path):
+        file = tmp_path / ".env"
+        file.write_text("")
 
-        result = EnvFile.read_text([mock_path], EnvFileFlags.NONE)
+        result = EnvFile.read_text([file], EnvFileFlags.NONE)
 
         assert result == ""
 
-    def test_read_text_returns_string(self, mocker: MockerFixture):
-        mock_path = MagicMock()
-        mock_path.read_text.return_value = "KEY=value"
+    def test_read_text_returns_string(self, tmp_path: Path):
+        file = tmp_path / ".env"
+        file.write_text("KEY=value")
 
-        result = EnvFile.read_text([mock_path], EnvFileFlags.NONE)
+        result = EnvFile.read_text([file], EnvFileFlags.NONE)
 
-        assert isinstance(result, str)
+        assert result == "KEY=value"
 
     def test_read_text_public_api(self):
         assert hasattr(EnvFile, "read_text")
         assert callable(EnvFile.read_text)
 
-    def test_read_text_accumulates_files(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_file1 = mocker.MagicMock(spec=Path)
-        mock_file1.read_text.return_value = "content1"
-        mock_file1.configure_mock(**{"__str__.return_value": "/path/file1"})
-        mock_file2 = mocker.MagicMock(spec=Path)
-        mock_file2.read_text.return_value = "content2"
-        mock_file2.configure_mock(**{"__str__.return_value": "/path/file2"})
-
-        result = EnvFile.read_text([mock_file1, mock_file2], EnvFileFlags.NONE)
+    def test_read_text_accumulates_files(self, tmp_path: Path):
+        file1 = tmp_path / ".env"
+        file1.write_text("content1")
+        file2 = tmp_path / ".env.prod"
+        file2.write_text("content2")
 
-        assert "content1" in result
-        assert "content2" in result
+        result = EnvFile.read_text([file1, file2], EnvFileFlags.NONE)
 
-    def test_read_text_handles_exception(self, mocker: MockerFixture):
-        EnvFile._EnvFile__loaded = []  # type: ignore
-        mock_file = mocker.MagicMock(spec=Path)
-        mock_file.read_text.side_effect = Exception("Read error")
-        mock_file.configure_mock(**{"__str__.return_value": "/path/to/file"})
+        assert result == f"content1\n{EnvFile.EOF_CHAR}\ncontent2"
 
-        result = EnvFile.read_text([mock_file], EnvFileFlags.NONE)
+    def test_read_text_handles_exception(self, tmp_path: Path):
+        result = EnvFile.read_text([tmp_path / "missing.env"], EnvFileFlags.NONE)
 
         assert result == ""
 
     def test_read_text_resets_loaded(self):
-        EnvFile._EnvFile__loaded = ["file1"]  # type: ignore
+        EnvFile._EnvFile__loaded = {"file1"}  # type: ignore
         EnvFile.read_text([], EnvFileFlags.RESET_ACCUMULATED)
-        assert EnvFile._EnvFile__loaded == []  # type: ignore
+        assert EnvFile._EnvFile__loaded == set()  # type: ignore
 
-    def test_read_text_skips_already_loaded(self, mocker: MockerFixture):
-        mock_path_str = "/path/to/file"
-        EnvFile._EnvFile__loaded = [mock_path_str]  # type: ignore
+    def test_read_text_skips_already_loaded(self, tmp_path: Path):
+        file = tmp_path / ".env"
+        file.write_text("should not read")
+        EnvFile._EnvFile__loaded = {str(file)}  # type: ignore
 
-        mock_path = mocker.MagicMock(spec=Path)
-        mock_path.__str__.return_value = mock_path_str  # type: ignore
-        mock_path.read_text.return_value = "should not read"
-
-        result = EnvFile.read_text([mock_path], EnvFileFlags.NONE)
+        result = EnvFile.read_text([file], EnvFileFlags.NONE)
 
         assert result == ""
 
+    def test_read_text_rereads_after_reset(self, tmp_path: Path):
+        file = tmp_path / ".env"
+        file.write_text("KEY=value")
+        EnvFile._EnvFile__loaded = {str(file)}  # type: ignore
 
-class TestEnvFileReadTextMocked:
-    def test_read_text_with_mock(self, mocker: MockerFixture):
-        mock_path = mocker.MagicMock()
-        mock_path.read_text.return_value = "KEY=value"
-        result = EnvFile.read_text([mock_path], EnvFileFlags.NONE)
-        assert isinstance(result, str)
+        result = EnvFile.read_text([file], EnvFileFlags.RESET_ACCUMULATED)
+
+        assert result == "KEY=value"
+        assert EnvFile._EnvFile__loaded == {str(file)}  # type: ignore
+
+    def test_read_text_relative_and_absolute_path_once(
+        self, tmp_path: Path, monkeypatch: MonkeyPatch, mocker: MockerFixture
+    ):
+        (tmp_path / ".env").write_text("KEY=value")
+        (tmp_path / ".env.prod").write_text("KEY=prod")
+        monkeypatch.chdir(tmp_path)
+        spy = mocker.spy(os, "getcwd")
+
+        result = EnvFile.read_text(
+            [Path(".env"), Path(".env.prod"), tmp_path / ".env"], EnvFileFlags.NONE
+        )
+
+        assert result == f"KEY=value\n{EnvFile.EOF_CHAR}\nKEY=prod"
+        assert spy.call_count == 1
+
+
+class TestEnvFileGetFilesReal:
+    def test_get_files_from_real_dir(self, tmp_path: Path):
+        for name in (".env", ".env.prod", ".env.dev", "readme.txt"):
+            (tmp_path / name).write_text("")
+        (tmp_path / "dir.env").mkdir()
+
+        result = EnvFile.get_files(
+            tmp_path,
+            "env",
+            EnvFileFlags.NONE,
+            EnvFilter(cur_values=["prod"], all_values=["dev", "prod"]),
+        )
+
+        assert result == [tmp_path / ".env", tmp_path / ".env.prod"]
 
 
 class TestEnvFileSelectChars:
@@ -55,6 +55,12 @@ class TestEnvFilterConstructor:
         f = EnvFilter()
         assert f.indicator == EnvFilter.DEFAULT_INDICATOR
 
+    def test_no_instance_dict(self):
+        f = EnvFilter()
+        assert not hasattr(f, "__dict__")
+        with pytest.raises(AttributeError):
+            f.other = None  # type: ignore
+
 
 class TestEnvFilterEquality:
     def test_equality_different_all_values(self):
@@ -124,6 +130,11 @@ class TestEnvFilterHasValue:
         found, _ = EnvFilter.has_value(".", "env")
         assert found is False
 
+    def test_has_value_follows_value_separators(self, monkeypatch: pytest.MonkeyPatch):
+        assert EnvFilter.has_value("dev+env", "dev") == (False, False)
+        monkeypatch.setattr(EnvFilter, "VALUE_SEPARATORS", "+")
+        assert EnvFilter.has_value("dev+env", "dev") == (True, False)
+
     def test_has_value_with_separators(self):
         found, _ = EnvFilter.has_value("dev.env", "env")
         assert found is True
@@ -195,3 +206,132 @@ class TestEnvFilterSearch:
         f = EnvFilter(indicator="env", cur_values=None)
         result = f.search("env")
         assert result == 0
+
+    def test_search_scope_ignores_empty_values(self):
+        f = EnvFilter(indicator="env", cur_values=["dev"], all_values=["", "prod"])
+        assert f.search(".env.prod") == -1
+        assert f.search(".env.test") == 0
+
+        f = EnvFilter(indicator="env", cur_values=["dev"], all_values=[""])
+        assert f.search(".env.prod") == 0
+
+    @pytest.mark.parametrize(
+        "input_str,expected",
+        [
+            (".env.prod", -1),
+            (".env.production", 0),
+            (".env.preprod", 0),
+            ("prod-env", -1),
+            (".env.PROD", 0),
+        ],
+    )
+    def test_search_scope_is_bounded(self, input_str: str, expected: int):
+        f = EnvFilter(indicator="env", cur_values=["dev"], all_values=["test", "prod"])
+        assert f.search(input_str) == expected
+
+    def test_search_finds_value_overlapping_unbounded_one(self):
+        assert EnvFilter.has_value("yx.x.x", "x.x") == (False, False)
+        f = EnvFilter(indicator="env", cur_values=["x.x"], all_values=["x.x", "z"])
+        assert f.search("env.yx.x.x") == 1
+        assert f.search("env.yx.x.z") == -1
+
+    def test_search_scope_without_separators(self):
+        values_re = EnvFilter._EnvFilter__get_values_re(("prod",), "")
+        assert values_re.search("prod")
+        assert not values_re.search("prod.env")
+        assert EnvFilter._EnvFilter__get_values_re(("",), ".") is None
+
+    def test_search_skips_regex_without_substrings(self):
+        get_values_re = EnvFilter._EnvFilter__get_values_re
+        get_values_re.cache_clear()
+        f = EnvFilter(cur_values=["prod"], all_values=["dev", "prod"])
+        assert f.search(".env.test") == 0
+        assert get_values_re.cache_info().misses == 0
+        assert f.search(".env.prod") == 1
+        assert get_values_re.cache_info().misses == 1
+
+    @pytest.mark.parametrize(
+        "cur_values,input_str,expected",
+        [
+            (["dev", "prod"], "prod.dev.env", 1),
+            (["b", "a-b"], "a-b.env", 1),
+            (["a-b", "b"], "a-b.env", 1),
+            (["prod", "prod-x"], ".env.prod-x", 1),
+            (["", "prod"], ".env.prod", 2),
+            ([""], ".env.prod", 0),
+            (["dev"], ".env.devel", 0),
+        ],
+    )
+    def test_search_cur_values_lowest_index(
+        self, cur_values: list[str], input_str: str, expected: int
+    ):
+        f = EnvFilter(cur_values=cur_values, all_values=["x"])
+        assert f.search(input_str) == expected
+
+
+@pytest.fixture(scope="module")
+def default_filter() -> EnvFilter:
+    return EnvFilter()
+
+
+@pytest.fixture(scope="module")
+def prod_filter() -> EnvFilter:
+    return EnvFilter(cur_values=["prod"], all_values=["dev", "test", "prod"])
+
+
+@pytest.fixture(scope="module")
+def platform_filter() -> EnvFilter:
+    return EnvFilter(
+        cur_values=["posix", "bsd", "macos"],
+        all_values=["posix", "bsd", "macos", "linux", "windows"],
+    )
+
+
+class TestEnvFilterSearchShared:
+    @pytest.mark.parametrize(
+        "candidate,expected",
+        [
+            (".env", 0),
+            ("env", 0),
+            ("dev.env", -1),
+            (".env.prod", -1),
+            (".envrc", -1),
+        ],
+    )
+    def test_search_default(
+        self, default_filter: EnvFilter, candidate: str, expected: int
+    ):
+        assert default_filter.search(candidate) == expected
+
+    @pytest.mark.parametrize(
+        "candidate,expected",
+        [
+            (".env", 0),
+            (".env.prod", 1),
+            ("prod-env", 1),
+            ("env_prod_en", 1),
+            (".env.es", 0),
+            (".env.dev", -1),
+            ("test.env", -1),
+            ("myenv.prod", -1),
+        ],
+    )
+    def test_search_prod(self, prod_filter: EnvFilter, candidate: str, expected: int):
+        assert prod_filter.search(candidate) == expected
+
+    @pytest.mark.parametrize(
+        "candidate,expected",
+        [
+            (".env", 0),
+            (".env.posix", 1),
+            (".env.bsd.macos", 2),
+            ("macos.env", 3),
+            (".env.prod", 0),
+            (".env.linux", -1),
+            ("windows_env", -1),
+        ],
+    )
+    def test_search_platforms(
+        self, platform_filter: EnvFilter, candidate: str, expected: int
+    ):
+        assert platform_filter.search(candidate) == expected
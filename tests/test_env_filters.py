@@ -112,3 +112,26 @@ class TestEnvFiltersProcess:
         result = EnvFilters.process(files, filters)
         assert "dev.env" in result
         assert "prod.env" in result
+
+    def test_process_last_filter_sorts_first(self):
+        files = [
+            ".env.linux.prod",
+            ".env.prod",
+            ".env.linux",
+            ".env",
+            ".env.posix.dev",
+            ".env.posix",
+        ]
+        filters = [
+            EnvFilter(cur_values=["posix", "linux"], all_values=["posix", "linux"]),
+            EnvFilter(cur_values=["dev", "prod"]),
+        ]
+        result = EnvFilters.process(files, filters)
+        assert result == [
+            ".env",
+            ".env.posix",
+            ".env.linux",
+            ".env.posix.dev",
+            ".env.prod",
+            ".env.linux.prod",
+        ]